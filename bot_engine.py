@@ -1,4 +1,5 @@
 import json
+import asyncio
 import time
 import logging
 import threading
@@ -9,7 +10,11 @@ import websocket
 import pandas as pd
 import numpy as np
 import ta
-from deriv_ta import DerivTA, Interval
+from deriv_ta import Interval, RecFlag, REC_FLAGS, get_multiple_analysis_async
+from indicator_kernels import wilder_atr, supertrend, ema_last, macd_line, window_mean_std, warmup as warmup_kernels
+
+# Granularity (seconds) -> deriv_ta Interval, for the Strategy 7 timeframe settings
+INTERVAL_BY_SECONDS = {item.value: item for item in Interval}
 
 class TradingBotEngine:
     STRATEGY_MAP = {
@@ -64,6 +69,9 @@ class TradingBotEngine:
         }
     }
 
+    STRAT7_MAX_CONCURRENCY = 4 # Symbols fetched at once per Strategy 7 sweep (one socket each)
+    STRAT7_TA_MAX_AGE = 300 # Seconds a mid/high TF analysis (forming bar included) may be reused across sweeps
+
     def __init__(self, config_path, emit_callback):
         self.config_path = config_path
         self.emit = emit_callback
@@ -77,7 +85,15 @@ class TradingBotEngine:
         self.ws_thread = None
         self.stop_event = threading.Event()
         self.screener_thread = None
+        self.metrics_thread = None
+        self.updates_pending = False # Set by high-frequency handlers, flushed by _metrics_loop
         self.strat7_cache = {} # Symbol -> { 'small': Analysis, 'mid': Analysis, 'high': Analysis, 'timestamp': float }
+        self._score_cache = {} # Symbol -> (core candles key, indicator snapshot) for Strategies 5/6
+        self._strat7_ta_cache = {} # Symbol -> { Interval: (fetched_at, Analysis, DataFrame) }
+        self._exit_ta_cache = {} # Symbol -> (1H candles key, 1H MACD divergence) for the exit engine
+        self._m15_trend_cache = {} # Symbol -> (15m candles key, {'ema50', 'st', 'st_dir'})
+        self._atr_state = {} # (Symbol, tf) -> (epoch, atr, close) of the last closed bar folded into ATR
+        self._atr_lock = threading.Lock()
 
         # Account metrics
         self.account_balance = 0.0
@@ -242,7 +258,7 @@ class TradingBotEngine:
             self.account_balance = data['balance']['balance']
             self.available_balance = self.account_balance
             self.total_equity = self.account_balance
-            self._emit_updates()
+            self.updates_pending = True
 
         elif msg_type == 'candles':
             echo = data.get('echo_req', {})
@@ -562,151 +578,207 @@ class TradingBotEngine:
                 if self.config.get('entry_type') == 'tick':
                     self._process_strategy(symbol, False)
 
-    def _calculate_supertrend(self, df, period=10, multiplier=3):
-        atr = ta.volatility.average_true_range(df['high'], df['low'], df['close'], window=period)
-        hl2 = (df['high'] + df['low']) / 2
-        upperband = hl2 + (multiplier * atr)
-        lowerband = hl2 - (multiplier * atr)
-
-        final_upperband = upperband.copy()
-        final_lowerband = lowerband.copy()
-
-        for i in range(1, len(df)):
-            if upperband.iloc[i] < final_upperband.iloc[i-1] or df['close'].iloc[i-1] > final_upperband.iloc[i-1]:
-                final_upperband.iloc[i] = upperband.iloc[i]
-            else:
-                final_upperband.iloc[i] = final_upperband.iloc[i-1]
-
-            if lowerband.iloc[i] > final_lowerband.iloc[i-1] or df['close'].iloc[i-1] < final_lowerband.iloc[i-1]:
-                final_lowerband.iloc[i] = lowerband.iloc[i]
-            else:
-                final_lowerband.iloc[i] = final_lowerband.iloc[i-1]
-
-        supertrend = [0.0] * len(df)
-        direction = [1] * len(df) # 1 for up, -1 for down
-
-        for i in range(1, len(df)):
-            if i == 1:
-                supertrend[i] = final_upperband.iloc[i]
-                direction[i] = -1
-                continue
-            if supertrend[i-1] == final_upperband.iloc[i-1]:
-                if df['close'].iloc[i] > final_upperband.iloc[i]:
-                    supertrend[i] = final_lowerband.iloc[i]
-                    direction[i] = 1
-                else:
-                    supertrend[i] = final_upperband.iloc[i]
-                    direction[i] = -1
-            else:
-                if df['close'].iloc[i] < final_lowerband.iloc[i]:
-                    supertrend[i] = final_upperband.iloc[i]
-                    direction[i] = -1
-                else:
-                    supertrend[i] = final_lowerband.iloc[i]
-                    direction[i] = 1
-        return pd.Series(supertrend), pd.Series(direction)
-
-    def _calculate_fractals(self, df, window=2):
-        """Identify Swing Highs and Lows (Fractals)."""
-        if len(df) < 2 * window + 1: return pd.Series([False]*len(df)), pd.Series([False]*len(df))
-
-        highs = df['high']
-        lows = df['low']
-
-        is_high = [False] * len(df)
-        is_low = [False] * len(df)
-
-        for i in range(window, len(df) - window):
-            # Swing High
-            if all(highs.iloc[i] > highs.iloc[i-window:i]) and all(highs.iloc[i] > highs.iloc[i+1:i+window+1]):
-                is_high[i] = True
-            # Swing Low
-            if all(lows.iloc[i] < lows.iloc[i-window:i]) and all(lows.iloc[i] < lows.iloc[i+1:i+window+1]):
-                is_low[i] = True
-
-        return pd.Series(is_high, index=df.index), pd.Series(is_low, index=df.index)
-
-    def _calculate_order_blocks(self, df, lookback=100):
-        """Identify Order Blocks: Last opposite candle before a strong impulsive move."""
-        if len(df) < lookback: return []
+    def _calculate_supertrend(self, high, low, close, period=10, multiplier=3):
+        """SuperTrend line and direction arrays from float64 high/low/close arrays."""
+        atr = wilder_atr(high, low, close, period)
+        return supertrend(high, low, close, atr, float(multiplier))
+
+    def _calculate_fractals(self, highs, lows, window=2):
+        """Identify Swing Highs and Lows (Fractals) as boolean masks over the high/low arrays."""
+        n = len(highs)
+        if n < 2 * window + 1: return np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+
+        # Compare every candidate bar against its k-th neighbours on both sides using shifted array views
+        core = slice(window, n - window)
+        swing_high = np.ones(n - 2 * window, dtype=bool)
+        swing_low = np.ones(n - 2 * window, dtype=bool)
+        for k in range(1, window + 1):
+            before = slice(window - k, n - window - k)
+            after = slice(window + k, n - window + k)
+            swing_high &= (highs[core] > highs[before]) & (highs[core] > highs[after])
+            swing_low &= (lows[core] < lows[before]) & (lows[core] < lows[after])
+
+        is_high = np.zeros(n, dtype=bool)
+        is_low = np.zeros(n, dtype=bool)
+        is_high[core] = swing_high
+        is_low[core] = swing_low
+        return is_high, is_low
+
+    def _calculate_order_blocks(self, o, h, l, c, ep, lookback=100):
+        """Identify Order Blocks: Last opposite candle before a strong impulsive move (OHLC/epoch arrays)."""
+        if len(c) < lookback: return []
+
+        bodies = np.abs(c - o)
 
         obs = []
-        for i in range(len(df) - 5, 5, -1):
+        for i in range(len(c) - 5, 5, -1):
             if i < 10: break
 
             # Simple impulse check: body size > 2x average of previous 10
-            avg_body = abs(df['close'].iloc[i-10:i] - df['open'].iloc[i-10:i]).mean()
-            body = abs(df['close'].iloc[i] - df['open'].iloc[i])
+            avg_body = bodies[i-10:i].mean()
 
-            if body > 2 * avg_body:
-                is_bullish_impulse = df['close'].iloc[i] > df['open'].iloc[i]
+            if bodies[i] > 2 * avg_body:
+                is_bullish_impulse = c[i] > o[i]
                 # Find last opposite candle
                 for j in range(i-1, i-6, -1):
-                    if is_bullish_impulse and df['close'].iloc[j] < df['open'].iloc[j]:
-                        obs.append({'price': df['low'].iloc[j], 'high': df['high'].iloc[j], 'type': 'Bullish OB', 'epoch': df['epoch'].iloc[j]})
+                    if is_bullish_impulse and c[j] < o[j]:
+                        obs.append({'price': l[j], 'high': h[j], 'type': 'Bullish OB', 'epoch': ep[j]})
                         break
-                    elif not is_bullish_impulse and df['close'].iloc[j] > df['open'].iloc[j]:
-                        obs.append({'price': df['high'].iloc[j], 'low': df['low'].iloc[j], 'type': 'Bearish OB', 'epoch': df['epoch'].iloc[j]})
+                    elif not is_bullish_impulse and c[j] > o[j]:
+                        obs.append({'price': h[j], 'low': l[j], 'type': 'Bearish OB', 'epoch': ep[j]})
                         break
             if len(obs) >= 5: break
         return obs
 
-    def _calculate_fvg(self, df, lookback=50):
-        """Identify Fair Value Gaps (FVG): Imbalance between 3 candles."""
-        if len(df) < 3: return []
+    def _calculate_fvg(self, h, l, ep, lookback=50):
+        """Identify Fair Value Gaps (FVG): Imbalance between 3 candles (high/low/epoch arrays)."""
+        if len(h) < 3: return []
 
         fvgs = []
-        for i in range(len(df) - 1, len(df) - lookback, -1):
+        for i in range(len(h) - 1, len(h) - lookback, -1):
             if i < 2: break
 
             # Bullish FVG: High of candle 1 < Low of candle 3
-            if df['high'].iloc[i-2] < df['low'].iloc[i]:
+            if h[i-2] < l[i]:
                 fvgs.append({
-                    'top': df['low'].iloc[i],
-                    'bottom': df['high'].iloc[i-2],
+                    'top': l[i],
+                    'bottom': h[i-2],
                     'type': 'Bullish FVG',
-                    'epoch': df['epoch'].iloc[i-1]
+                    'epoch': ep[i-1]
                 })
             # Bearish FVG: Low of candle 1 > High of candle 3
-            elif df['low'].iloc[i-2] > df['high'].iloc[i]:
+            elif l[i-2] > h[i]:
                 fvgs.append({
-                    'top': df['low'].iloc[i-2],
-                    'bottom': df['high'].iloc[i],
+                    'top': l[i-2],
+                    'bottom': h[i],
                     'type': 'Bearish FVG',
-                    'epoch': df['epoch'].iloc[i-1]
+                    'epoch': ep[i-1]
                 })
             if len(fvgs) >= 10: break
         return fvgs
 
-    def _detect_macd_divergence(self, df, window=20):
-        if len(df) < window + 10: return 0 # No signal
-
-        macd_ind = ta.trend.MACD(df['close'])
-        macd = macd_ind.macd()
+    def _detect_macd_divergence(self, close, window=20):
+        """MACD divergence of the last close against the previous swing window (close is a float64 array)."""
+        if len(close) < window + 10: return 0 # No signal
 
-        # Bullish Divergence: Price Lower Low, MACD Higher Low
-        p_idx = df['close'].iloc[-window:].idxmin()
-        m_idx = macd.iloc[-window:].idxmin()
+        macd = macd_line(close)
+        last_close = close[-1]
+        last_macd = macd[-1]
 
-        # Check previous low
-        p_prev_low = df['close'].iloc[-2*window:-window].min()
-        m_prev_low = macd.iloc[-2*window:-window].min()
+        # Previous swing window, sliced once for both checks
+        prev_close = close[-2*window:-window]
+        prev_macd = macd[-2*window:-window]
+        prev_macd = prev_macd[~np.isnan(prev_macd)]
+        if len(prev_macd) == 0: return 0 # MACD not warmed up over the swing window
 
-        if df['close'].iloc[-1] < p_prev_low and macd.iloc[-1] > m_prev_low:
+        # Bullish Divergence: Price Lower Low, MACD Higher Low
+        if last_close < prev_close.min() and last_macd > prev_macd.min():
             return 1 # Bullish Divergence
 
         # Bearish Divergence: Price Higher High, MACD Lower High
-        p_idx_h = df['close'].iloc[-window:].idxmax()
-        m_idx_h = macd.iloc[-window:].idxmax()
-
-        p_prev_high = df['close'].iloc[-2*window:-window].max()
-        m_prev_high = macd.iloc[-2*window:-window].max()
-
-        if df['close'].iloc[-1] > p_prev_high and macd.iloc[-1] < m_prev_high:
+        if last_close > prev_close.max() and last_macd < prev_macd.max():
             return -1 # Bearish Divergence
 
         return 0
 
+    @staticmethod
+    def _hlc_arrays(candles):
+        """high/low/close float64 arrays straight from candle dicts, skipping the DataFrame round-trip."""
+        n = len(candles)
+        return tuple(np.fromiter((c[k] for c in candles), dtype=float, count=n) for k in ('high', 'low', 'close'))
+
+    @staticmethod
+    def _closes(candles):
+        """Close prices as a float64 array, for last-value kernels that don't need a DataFrame."""
+        return np.fromiter((c['close'] for c in candles), dtype=float, count=len(candles))
+
+    def _latest_atr(self, symbol, tf, candles, window=14, with_prev=False):
+        """Last-bar ATR for a candle list, carried forward incrementally per (symbol, tf).
+
+        Closed bars are folded into self._atr_state once; the last bar may still be forming,
+        so it is applied on top of the stored value every call.
+        """
+        n = len(candles)
+        if n <= window:
+            atr = wilder_atr(*self._hlc_arrays(candles), window)
+            return (0.0, atr[-1]) if with_prev else atr[-1]
+
+        key = (symbol, tf)
+        # Screener, monitor and trading threads all call this; fold under a lock so updates don't race
+        with self._atr_lock:
+            state = self._atr_state.get(key)
+            start = None
+            if state:
+                # Locate the last folded bar (epochs ascend)
+                for k in range(n - 2, -1, -1):
+                    ep = candles[k]['epoch']
+                    if ep == state[0]:
+                        start = k
+                        break
+                    if ep < state[0]: break
+
+            if start is None:
+                closed = candles[:-1]
+                atr = wilder_atr(*self._hlc_arrays(closed), window)
+                state = (closed[-1]['epoch'], atr[-1], closed[-1]['close'])
+            else:
+                _, atr_val, prev_close = state
+                for c in candles[start + 1:n - 1]:
+                    tr = max(c['high'] - c['low'], abs(c['high'] - prev_close), abs(c['low'] - prev_close))
+                    atr_val = (atr_val * (window - 1) + tr) / window
+                    prev_close = c['close']
+                state = (candles[n - 2]['epoch'], atr_val, prev_close)
+            self._atr_state[key] = state
+
+        last = candles[-1]
+        prev_close = state[2]
+        tr = max(last['high'] - last['low'], abs(last['high'] - prev_close), abs(last['low'] - prev_close))
+        atr = (state[1] * (window - 1) + tr) / window
+        return (state[1], atr) if with_prev else atr
+
+    @staticmethod
+    def _candles_key(candles):
+        """Cheap identity for a candle list: changes whenever a bar is added or the last bar updates."""
+        last = candles[-1]
+        return (len(candles), last['epoch'], last['close'])
+
+    def _strat5_core_indicators(self, df_core, is_multiplier):
+        """Indicator snapshot for the Strategy 5 core frame (memoized by _update_screener)."""
+        high = df_core['high'].to_numpy(dtype=float)
+        low = df_core['low'].to_numpy(dtype=float)
+        closes = df_core['close'].to_numpy(dtype=float)
+        ind = {'last_close': closes[-1]}
+
+        if is_multiplier:
+            # 1H Order Blocks & FVGs
+            opens = df_core['open'].to_numpy(dtype=float)
+            epochs = df_core['epoch'].to_numpy()
+            ind['order_blocks'] = self._calculate_order_blocks(opens, high, low, closes, epochs)
+            ind['fvgs'] = self._calculate_fvg(high, low, epochs)
+        else:
+            # 5m Fractals
+            f_high, f_low = self._calculate_fractals(high, low)
+            ind['fractal_highs'] = high[f_high].tolist()
+            ind['fractal_lows'] = low[f_low].tolist()
+
+        ind['ema50'] = ema_last(closes, 50)
+        ind['ema200'] = ema_last(closes, 200)
+        _, st_dir = self._calculate_supertrend(high, low, closes)
+        ind['st_dir'] = st_dir[-1]
+        ind['adx'] = ta.trend.ADXIndicator(df_core['high'], df_core['low'], df_core['close']).adx().iat[-1]
+
+        ind['rsi'] = ta.momentum.RSIIndicator(df_core['close']).rsi().iat[-1]
+        stoch_rsi_ind = ta.momentum.StochRSIIndicator(df_core['close'])
+        ind['srsi_k'] = stoch_rsi_ind.stochrsi_k().iat[-1]
+        ind['srsi_d'] = stoch_rsi_ind.stochrsi_d().iat[-1]
+        ind['macd_div'] = self._detect_macd_divergence(closes)
+
+        bb = ta.volatility.BollingerBands(df_core['close'])
+        ind['bb_mavg'] = bb.bollinger_mavg().iat[-1]
+        ind['bb_hband'] = bb.bollinger_hband().iat[-1]
+        ind['bb_lband'] = bb.bollinger_lband().iat[-1]
+        return ind
+
     def _update_screener(self, symbol):
         strat_key = self.config.get('active_strategy', 'strategy_1')
         if strat_key == 'strategy_6':
@@ -727,27 +799,31 @@ class TradingBotEngine:
         contract_type = self.config.get('contract_type', 'rise_fall')
         is_multiplier = (contract_type == 'multiplier')
 
-        # Select Base Dataframe
-        df_core = None
-        if is_multiplier:
-            if len(htf_candles) < 100: return
-            df_core = pd.DataFrame(htf_candles)
-            # Calculate 1H Order Blocks & FVGs
-            obs = self._calculate_order_blocks(df_core)
-            fvgs = self._calculate_fvg(df_core)
-            with self.data_lock:
-                sd['order_blocks'] = obs
-                sd['fvgs'] = fvgs
+        # Select Base Candles (1H for Multiplier, 5m for Rise & Fall)
+        core_candles = htf_candles if is_multiplier else m5_candles
+        if len(core_candles) < 100: return
+
+        # Core indicators only change when the core candle set does
+        core_key = ('strategy_5', is_multiplier, self._candles_key(core_candles))
+        cached = self._score_cache.get(symbol)
+        if cached and cached[0] == core_key:
+            ind = cached[1]
         else:
-            if len(m5_candles) < 100: return
-            df_core = pd.DataFrame(m5_candles)
-            # Calculate 5m Fractals
-            f_high, f_low = self._calculate_fractals(df_core)
-            with self.data_lock:
-                sd['fractal_highs'] = df_core['high'][f_high].tolist()
-                sd['fractal_lows'] = df_core['low'][f_low].tolist()
+            ind = self._strat5_core_indicators(pd.DataFrame(core_candles), is_multiplier)
+            self._score_cache[symbol] = (core_key, ind)
 
-        last_close = df_core['close'].iloc[-1]
+        with self.data_lock:
+            if is_multiplier:
+                sd['order_blocks'] = ind['order_blocks']
+                sd['fvgs'] = ind['fvgs']
+            else:
+                sd['fractal_highs'] = ind['fractal_highs']
+                sd['fractal_lows'] = ind['fractal_lows']
+
+        last_close = ind['last_close']
+        ema50 = ind['ema50']
+        adx_val = ind['adx']
+        srsi_k = ind['srsi_k']
 
         # --- 0. SESSION & INSTRUMENT CONTEXT ---
         now_utc = datetime.now(timezone.utc)
@@ -759,19 +835,14 @@ class TradingBotEngine:
         # --- 1. TREND BLOCK ---
         # EMA 50/200, SuperTrend, ADX
         t_pos, t_neg = 0, 0
-        ema50 = ta.trend.EMAIndicator(df_core['close'], window=50).ema_indicator().iloc[-1]
-        ema200 = ta.trend.EMAIndicator(df_core['close'], window=200).ema_indicator().iloc[-1]
-
         if last_close > ema50: t_pos += 1
         else: t_neg += 1
-        if ema50 > ema200: t_pos += 1
+        if ema50 > ind['ema200']: t_pos += 1
         else: t_neg += 1
 
-        st, st_dir = self._calculate_supertrend(df_core)
-        if st_dir.iloc[-1] == 1: t_pos += 2
+        if ind['st_dir'] == 1: t_pos += 2
         else: t_neg += 2
 
-        adx_val = ta.trend.ADXIndicator(df_core['high'], df_core['low'], df_core['close']).adx().iloc[-1]
         if adx_val > 25:
             if last_close > ema50: t_pos += 1
             else: t_neg += 1
@@ -781,19 +852,15 @@ class TradingBotEngine:
         # --- 2. MOMENTUM BLOCK ---
         # RSI, Stoch RSI, MACD Divergence
         m_pos, m_neg = 0, 0
-        rsi = ta.momentum.RSIIndicator(df_core['close']).rsi().iloc[-1]
-        if rsi > 50: m_pos += 1
+        if ind['rsi'] > 50: m_pos += 1
         else: m_neg += 1
 
-        stoch_rsi_ind = ta.momentum.StochRSIIndicator(df_core['close'])
-        srsi_k = stoch_rsi_ind.stochrsi_k().iloc[-1]
-        srsi_d = stoch_rsi_ind.stochrsi_d().iloc[-1]
         if srsi_k > 0.5: m_pos += 1
         else: m_neg += 1
-        if srsi_k > srsi_d: m_pos += 1
+        if srsi_k > ind['srsi_d']: m_pos += 1
         else: m_neg += 1
 
-        div = self._detect_macd_divergence(df_core)
+        div = ind['macd_div']
         if div == 1: m_pos += 2
         elif div == -1: m_neg += 2
 
@@ -802,13 +869,12 @@ class TradingBotEngine:
         # --- 3. VOLATILITY BLOCK ---
         # ATR, Bollinger Bands
         v_pos, v_neg = 0, 0
-        bb = ta.volatility.BollingerBands(df_core['close'])
-        if last_close > bb.bollinger_mavg().iloc[-1]: v_pos += 1
+        if last_close > ind['bb_mavg']: v_pos += 1
         else: v_neg += 1
 
         # Band walk/breakout
-        if last_close > bb.bollinger_hband().iloc[-1]: v_pos += 1
-        elif last_close < bb.bollinger_lband().iloc[-1]: v_neg += 1
+        if last_close > ind['bb_hband']: v_pos += 1
+        elif last_close < ind['bb_lband']: v_neg += 1
 
         vol_score = (v_pos - v_neg) / (v_pos + v_neg) if (v_pos + v_neg) > 0 else 0
 
@@ -886,14 +952,7 @@ class TradingBotEngine:
                 confidence = (struct_score * 35) + (mom_score * 35) + (vol_score * 20) + (trend_score * 10)
 
         # Multiplier / Expiry Logic
-        atr_val = ta.volatility.AverageTrueRange(df_core['high'], df_core['low'], df_core['close']).average_true_range().iloc[-1]
-
-        # 1m ATR for Volatility Freeze
-        atr_1m = 0
-        if ltf_candles:
-            df_1m = pd.DataFrame(ltf_candles)
-            if len(df_1m) >= 14:
-                atr_1m = ta.volatility.AverageTrueRange(df_1m['high'], df_1m['low'], df_1m['close']).average_true_range().iloc[-1]
+        atr_val = self._latest_atr(symbol, 'htf' if is_multiplier else 'm5', core_candles)
 
         suggested_multiplier = 10
         if is_multiplier:
@@ -926,16 +985,14 @@ class TradingBotEngine:
         # 1m ATR for Volatility Freeze (v4.0 Instrument Specific)
         atr_1m = 0
         atr_24h = 0
-        if ltf_candles:
-            df_1m = pd.DataFrame(ltf_candles)
-            if len(df_1m) >= 14:
-                atr_1m = ta.volatility.AverageTrueRange(df_1m['high'], df_1m['low'], df_1m['close']).average_true_range().iloc[-1]
+        if len(ltf_candles) >= 14:
+            atr_1m = self._latest_atr(symbol, 'ltf', ltf_candles)
 
         # Calculate Baseline ATR from 1H candles (24 periods)
         if len(htf_candles) >= 24:
-            df_24h = pd.DataFrame(htf_candles[-24:])
-            atr_24h = ta.volatility.AverageTrueRange(df_24h['high'], df_24h['low'], df_24h['close']).average_true_range().iloc[-1]
+            atr_24h = wilder_atr(*self._hlc_arrays(htf_candles[-24:]))[-1]
 
+        # Plain Python scalars only: the SocketIO JSON encoder cannot serialize numpy ints
         self.screener_data[symbol] = {
             'confidence': round(confidence, 1),
             'threshold': adaptive_threshold,
@@ -946,42 +1003,33 @@ class TradingBotEngine:
             'momentum': round(mom_score, 1),
             'volatility': round(vol_score, 1),
             'structure': round(struct_score, 1),
-            'adx': round(adx_val, 1),
-            'srsi_k': round(srsi_k, 4),
-            'atr': round(atr_val, 4),
-            'atr_1m': round(atr_1m, 6),
-            'atr_24h': round(atr_24h, 6),
+            'adx': round(float(adx_val), 1),
+            'srsi_k': round(float(srsi_k), 4),
+            'atr': round(float(atr_val), 4),
+            'atr_1m': round(float(atr_1m), 6),
+            'atr_24h': round(float(atr_24h), 6),
             'is_dead_hours': is_dead_hours,
             'expiry_min': suggested_expiry,
             'multiplier': suggested_multiplier,
-            'st_dir': st_dir.iloc[-1],
+            'st_dir': int(ind['st_dir']),
             'last_update': time.time()
         }
 
-        self.emit('screener_update', {'symbol': symbol, 'data': self.screener_data[symbol]})
-
-    def _update_screener_v1(self, symbol):
-        with self.data_lock:
-            sd = self.symbol_data.get(symbol)
-            if not sd: return
-            htf_candles = list(sd.get('htf_candles', [])) # 1H Macro Bias
-            m15_candles = list(sd.get('m15_candles', [])) # 15m Trend
-            daily_candles = list(sd.get('daily_candles', []))
-            snr_zones = list(sd.get('snr_zones', []))
-
-        if len(m15_candles) < 200: return
+        return self.screener_data[symbol]
 
+    def _strat6_core_indicators(self, symbol, m15_candles):
+        """Trend/momentum/volatility blocks for the Strategy 6 15m frame (memoized by _update_screener_v1)."""
         df_h = pd.DataFrame(m15_candles) # Using 15m for Core Analysis smoothing
-        df_macro = pd.DataFrame(htf_candles) # 1H for Bias
-        last_close = df_h['close'].iloc[-1]
+        last_close = df_h['close'].iat[-1]
 
         # --- v4.0 Dimensionality Reduction: Requires at least ONE from each category ---
 
         # --- A) TREND BLOCK (Weight 3) ---
         t_signals = []
-        ema50 = ta.trend.EMAIndicator(df_h['close'], window=50).ema_indicator().iloc[-1]
-        ema200 = ta.trend.EMAIndicator(df_h['close'], window=200).ema_indicator().iloc[-1]
-        sma20 = ta.trend.SMAIndicator(df_h['close'], window=20).sma_indicator().iloc[-1]
+        closes = df_h['close'].to_numpy(dtype=float)
+        ema50 = ema_last(closes, 50)
+        ema200 = ema_last(closes, 200)
+        sma20, std20 = window_mean_std(closes, 20)
 
         if last_close > ema50: t_signals.append(1)
         else: t_signals.append(-1)
@@ -991,72 +1039,115 @@ class TradingBotEngine:
         else: t_signals.append(-1)
 
         adx_ind = ta.trend.ADXIndicator(df_h['high'], df_h['low'], df_h['close'])
-        adx = adx_ind.adx().iloc[-1]
+        adx = adx_ind.adx().iat[-1]
         if adx > 25:
             if last_close > ema50: t_signals.append(1)
             else: t_signals.append(-1)
 
         ichimoku = ta.trend.IchimokuIndicator(df_h['high'], df_h['low'])
-        span_a = ichimoku.ichimoku_a().iloc[-1]
-        span_b = ichimoku.ichimoku_b().iloc[-1]
+        span_a = ichimoku.ichimoku_a().iat[-1]
+        span_b = ichimoku.ichimoku_b().iat[-1]
         if last_close > span_a and last_close > span_b: t_signals.append(1)
         elif last_close < span_a and last_close < span_b: t_signals.append(-1)
 
         macd_ind = ta.trend.MACD(df_h['close'])
-        if macd_ind.macd().iloc[-1] > macd_ind.macd_signal().iloc[-1]: t_signals.append(1)
+        if macd_ind.macd().iat[-1] > macd_ind.macd_signal().iat[-1]: t_signals.append(1)
         else: t_signals.append(-1)
 
         trend_sentiment = sum(t_signals) / len(t_signals) if t_signals else 0
-        trend_score = trend_sentiment * 3
 
         # --- B) MOMENTUM BLOCK (Weight 2) ---
         m_signals = []
-        rsi = ta.momentum.RSIIndicator(df_h['close']).rsi().iloc[-1]
+        rsi = ta.momentum.RSIIndicator(df_h['close']).rsi().iat[-1]
         if rsi > 50: m_signals.append(1)
         else: m_signals.append(-1)
 
-        stoch_rsi = ta.momentum.StochRSIIndicator(df_h['close']).stochrsi_k().iloc[-1]
+        stoch_rsi = ta.momentum.StochRSIIndicator(df_h['close']).stochrsi_k().iat[-1]
         if stoch_rsi > 0.5: m_signals.append(1)
         else: m_signals.append(-1)
 
-        wr = ta.momentum.WilliamsRIndicator(df_h['high'], df_h['low'], df_h['close']).williams_r().iloc[-1]
+        wr = ta.momentum.WilliamsRIndicator(df_h['high'], df_h['low'], df_h['close']).williams_r().iat[-1]
         if wr > -50: m_signals.append(1)
         else: m_signals.append(-1)
 
-        roc = ta.momentum.ROCIndicator(df_h['close']).roc().iloc[-1]
+        roc = ta.momentum.ROCIndicator(df_h['close']).roc().iat[-1]
         if roc > 0: m_signals.append(1)
         else: m_signals.append(-1)
 
-        cci = ta.trend.CCIIndicator(df_h['high'], df_h['low'], df_h['close']).cci().iloc[-1]
+        cci = ta.trend.CCIIndicator(df_h['high'], df_h['low'], df_h['close']).cci().iat[-1]
         if cci > 0: m_signals.append(1)
         else: m_signals.append(-1)
 
         mom_sentiment = sum(m_signals) / len(m_signals) if m_signals else 0
-        mom_score = mom_sentiment * 2
 
         # --- C) VOLATILITY BLOCK (Weight 1) ---
         v_pos, v_neg = 0, 0
-        atr_ind = ta.volatility.AverageTrueRange(df_h['high'], df_h['low'], df_h['close'])
-        atr = atr_ind.average_true_range().iloc[-1]
-        atr_prev = atr_ind.average_true_range().iloc[-2]
+        atr_prev, atr = self._latest_atr(symbol, 'm15', m15_candles, with_prev=True)
         if atr > atr_prev: v_pos += 0.5
 
         bb = ta.volatility.BollingerBands(df_h['close'])
-        bbw = (bb.bollinger_hband().iloc[-1] - bb.bollinger_lband().iloc[-1]) / bb.bollinger_mavg().iloc[-1]
-        prev_bbw = (bb.bollinger_hband().iloc[-2] - bb.bollinger_lband().iloc[-2]) / bb.bollinger_mavg().iloc[-2]
+        # Each band accessor builds a new Series, so pull every band out once
+        bb_h = bb.bollinger_hband().to_numpy()
+        bb_l = bb.bollinger_lband().to_numpy()
+        bb_m = bb.bollinger_mavg().to_numpy()
+        bbw = (bb_h[-1] - bb_l[-1]) / bb_m[-1]
+        prev_bbw = (bb_h[-2] - bb_l[-2]) / bb_m[-2]
         if bbw > prev_bbw: v_pos += 0.5
 
-        dc = ta.volatility.DonchianChannel(df_h['high'], df_h['low'], df_h['close'])
-        dc_mid = (dc.donchian_channel_hband().iloc[-1] + dc.donchian_channel_lband().iloc[-1]) / 2
+        # Donchian / Keltner midlines only need the last 20 bars (frame is >= 200 bars here)
+        highs = df_h['high'].to_numpy(dtype=float)
+        lows = df_h['low'].to_numpy(dtype=float)
+        dc_mid = (highs[-20:].max() + lows[-20:].min()) / 2
         if last_close > dc_mid: v_pos += 0.5
         else: v_neg += 0.5
 
-        kc = ta.volatility.KeltnerChannel(df_h['high'], df_h['low'], df_h['close'])
-        if last_close > kc.keltner_channel_mband().iloc[-1]: v_pos += 0.5
+        kc_mband, _ = window_mean_std((highs + lows + closes) / 3.0, 20)
+        if last_close > kc_mband: v_pos += 0.5
         else: v_neg += 0.5
 
         vol_sentiment = (v_pos - v_neg) / (v_pos + v_neg) if (v_pos + v_neg) > 0 else 0
-        vol_score = vol_sentiment * 1
+
+        return {
+            'last_close': last_close,
+            'ema50': ema50,
+            'adx': adx,
+            'atr': atr,
+            'trend_sentiment': trend_sentiment,
+            'mom_sentiment': mom_sentiment,
+            'vol_sentiment': vol_sentiment,
+            'z_score': (last_close - sma20) / std20,
+            'bb_hband': bb_h[-1],
+            'bb_lband': bb_l[-1]
+        }
+
+    def _update_screener_v1(self, symbol):
+        with self.data_lock:
+            sd = self.symbol_data.get(symbol)
+            if not sd: return
+            m15_candles = list(sd.get('m15_candles', [])) # 15m Trend
+            daily_candles = list(sd.get('daily_candles', []))
+            snr_zones = list(sd.get('snr_zones', []))
+
+        if len(m15_candles) < 200: return
+
+        # Trend/momentum/volatility blocks only change when the 15m frame does
+        core_key = ('strategy_6', self._candles_key(m15_candles))
+        cached = self._score_cache.get(symbol)
+        if cached and cached[0] == core_key:
+            ind = cached[1]
+        else:
+            ind = self._strat6_core_indicators(symbol, m15_candles)
+            self._score_cache[symbol] = (core_key, ind)
+
+        last_close = ind['last_close']
+        ema50 = ind['ema50']
+        adx = ind['adx']
+        atr = ind['atr']
+        trend_sentiment = ind['trend_sentiment']
+        mom_sentiment = ind['mom_sentiment']
+        trend_score = trend_sentiment * 3
+        mom_score = mom_sentiment * 2
+        vol_score = ind['vol_sentiment'] * 1
 
         # --- D) STRUCTURE BLOCK (Weight 2) ---
         s_pos, s_neg = 0, 0
@@ -1064,14 +1155,11 @@ class TradingBotEngine:
         if abs(dist) < 0.05: s_pos += 1
         elif abs(dist) > 0.1: s_neg += 0.5
 
-        sma20_v = df_h['close'].rolling(window=20).mean()
-        std20_v = df_h['close'].rolling(window=20).std()
-        z_score = (last_close - sma20_v.iloc[-1]) / std20_v.iloc[-1]
-        if abs(z_score) < 2: s_pos += 1
+        if abs(ind['z_score']) < 2: s_pos += 1
         else: s_neg += 1
 
-        if last_close >= bb.bollinger_hband().iloc[-1]: s_neg += 1
-        elif last_close <= bb.bollinger_lband().iloc[-1]: s_pos += 1
+        if last_close >= ind['bb_hband']: s_neg += 1
+        elif last_close <= ind['bb_lband']: s_pos += 1
 
         if daily_candles and len(daily_candles) >= 2:
             prev_day = daily_candles[-2]
@@ -1114,10 +1202,8 @@ class TradingBotEngine:
         if abs_conf >= 80: suggested_multiplier = 50
         elif abs_conf >= 65: suggested_multiplier = 20
 
-        # 1m ATR for UI and Volatility Freeze
-        atr_1m = 0
-        if not df_h.empty:
-            atr_1m = ta.volatility.AverageTrueRange(df_h['high'], df_h['low'], df_h['close']).average_true_range().iloc[-1]
+        # 1m ATR for UI and Volatility Freeze (same core frame as the volatility block)
+        atr_1m = atr
 
         self.screener_data[symbol] = {
             'confidence': round(confidence, 1),
@@ -1127,68 +1213,111 @@ class TradingBotEngine:
             'momentum': round(mom_score, 1),
             'volatility': round(vol_score, 1),
             'structure': round(struct_score, 1),
-            'adx': round(adx, 1),
-            'atr_1m': round(atr_1m, 6),
+            'adx': round(float(adx), 1),
+            'atr_1m': round(float(atr_1m), 6),
             'expiry_min': suggested_expiry,
             'multiplier': suggested_multiplier,
             'last_update': time.time()
         }
 
-        self.emit('screener_update', {'symbol': symbol, 'data': self.screener_data[symbol]})
+        return self.screener_data[symbol]
 
     def _background_screener_loop(self):
         """Background thread to update screener analysis for Strategies 5, 6, and 7 without blocking main engine."""
+        try:
+            warmup_kernels() # JIT/cache-load the indicator kernels before the first sweep needs them
+        except Exception as e:
+            logging.error(f"Indicator kernel warmup failed: {e}")
+        asyncio.run(self._screener_main())
+
+    async def _screener_main(self):
+        """Screener sweeps on a single event loop that lives as long as the thread (no loop per sweep)."""
+        loop = asyncio.get_running_loop()
         with ThreadPoolExecutor(max_workers=5) as executor:
             while not self.stop_event.is_set():
                 strat_key = self.config.get('active_strategy')
                 symbols = self.config.get('symbols', [])
 
                 if strat_key == 'strategy_7':
-                    for symbol in symbols:
-                        if self.stop_event.is_set(): break
-                        executor.submit(self._update_strat7_analysis, symbol)
-                        time.sleep(2.0) # Increased throttle for Strategy 7 (heavy network)
+                    # Network-bound: gather all symbols on the loop instead of throttled thread submits
+                    try:
+                        results = await self._strat7_sweep(symbols)
+                        self._emit_screener_batch(zip(symbols, results))
+                    except Exception as e:
+                        logging.error(f"Strategy 7 sweep error: {e}")
                 elif strat_key in ['strategy_5', 'strategy_6']:
-                    for symbol in symbols:
-                        if self.stop_event.is_set(): break
-                        executor.submit(self._update_screener, symbol)
-                        time.sleep(0.5)
+                    # CPU-bound scoring stays on the worker pool, which already bounds concurrency
+                    futures = [loop.run_in_executor(executor, self._update_screener, symbol) for symbol in symbols]
+                    results = []
+                    for symbol, result in zip(symbols, await asyncio.gather(*futures, return_exceptions=True)):
+                        if isinstance(result, Exception):
+                            logging.error(f"Screener update error for {symbol}: {result}")
+                        else:
+                            results.append((symbol, result))
+                    try:
+                        self._emit_screener_batch(results)
+                    except Exception as e:
+                        logging.error(f"Screener batch emit error: {e}")
 
                 # Dynamic sleep: shorter if we need frequent updates, longer otherwise
                 sleep_time = 30 if strat_key == 'strategy_7' else 10
                 for _ in range(sleep_time):
                     if self.stop_event.is_set(): break
-                    time.sleep(1)
+                    await asyncio.sleep(1)
+
+    def _emit_screener_batch(self, results):
+        """Send the whole sweep as one screener_batch keyed by symbol."""
+        updates = {symbol: data for symbol, data in results if data}
+        if updates:
+            self.emit('screener_batch', {'updates': updates, 'ts': time.time()})
 
     def _calculate_adr(self, daily_candles, window=14):
         if len(daily_candles) < window: return 0
         ranges = [c['high'] - c['low'] for c in daily_candles[-window:]]
         return sum(ranges) / len(ranges)
 
-    def _update_strat7_analysis(self, symbol):
-        tf_small_val = int(self.config.get('strat7_small_tf', 60))
-        tf_mid_val = int(self.config.get('strat7_mid_tf', 300))
-        tf_high_val = int(self.config.get('strat7_high_tf', 3600))
+    async def _strat7_sweep(self, symbols):
+        """Refresh Strategy 7 analysis for all symbols concurrently, bounded by STRAT7_MAX_CONCURRENCY."""
+        sem = asyncio.Semaphore(self.STRAT7_MAX_CONCURRENCY)
+        intervals = self._strat7_intervals()
+        return await asyncio.gather(*[self._update_strat7_analysis(symbol, sem, intervals) for symbol in symbols])
 
-        def val_to_interval(val):
-            for item in Interval:
-                if item.value == val: return item
-            return Interval.INTERVAL_1_MINUTE
+    def _strat7_intervals(self):
+        """Small/mid/high deriv_ta intervals from the config, resolved once per sweep."""
+        return tuple(
+            INTERVAL_BY_SECONDS.get(int(self.config.get(key, default)), Interval.INTERVAL_1_MINUTE)
+            for key, default in (('strat7_small_tf', 60), ('strat7_mid_tf', 300), ('strat7_high_tf', 3600))
+        )
+
+    async def _update_strat7_analysis(self, symbol, sem, intervals):
+        i_small, i_mid, i_high = intervals
 
         try:
-            h_small = DerivTA(symbol=symbol, interval=val_to_interval(tf_small_val))
-            h_mid = DerivTA(symbol=symbol, interval=val_to_interval(tf_mid_val))
-            h_high = DerivTA(symbol=symbol, interval=val_to_interval(tf_high_val))
+            if self.stop_event.is_set(): return
 
-            a_small = h_small.get_analysis()
-            a_mid = h_mid.get_analysis()
-            a_high = h_high.get_analysis()
+            # The small TF drives the entry flip, so it is refetched every sweep; mid/high reuse the last
+            # analysis while it is younger than half a bar, capped at STRAT7_TA_MAX_AGE
+            now = time.time()
+            ta_cache = self._strat7_ta_cache.setdefault(symbol, {})
+            stale = [
+                i for i in dict.fromkeys(intervals)
+                if i == i_small or i not in ta_cache
+                or now - ta_cache[i][0] >= min(i.value / 2, self.STRAT7_TA_MAX_AGE)
+            ]
+            async with sem:
+                results = await get_multiple_analysis_async(symbol, stale)
+            for interval, (analysis, df) in results.items():
+                ta_cache[interval] = (now, analysis, df)
+
+            a_small = ta_cache[i_small][1]
+            _, a_mid, df_mid = ta_cache[i_mid]
+            a_high = ta_cache[i_high][1]
 
             self.strat7_cache[symbol] = {
                 'small': a_small,
                 'mid': a_mid,
                 'high': a_high,
-                'timestamp': time.time()
+                'timestamp': ta_cache[i_small][0] # Freshness of the small TF gates entries in _process_strategy_7
             }
 
             # v4.0 Pullback Alignment Logic
@@ -1196,10 +1325,6 @@ class TradingBotEngine:
             # Mid TF (15m): Bullish/Bearish (Same as High)
             # Small TF (1m): Must be opposite (Pullback)
 
-            rec_small = a_small.summary['RECOMMENDATION']
-            rec_mid = a_mid.summary['RECOMMENDATION']
-            rec_high = a_high.summary['RECOMMENDATION']
-
             # ADR Guard
             sd = self.symbol_data.get(symbol, {})
             adr = self._calculate_adr(sd.get('daily_candles', []))
@@ -1216,32 +1341,34 @@ class TradingBotEngine:
             total_signals = total_buy + total_sell + a_small.summary['NEUTRAL'] + a_mid.summary['NEUTRAL'] + a_high.summary['NEUTRAL']
             confidence = ((total_buy - total_sell) / total_signals) * 100 if total_signals > 0 else 0
 
-            df_mid = h_mid.get_dataframe()
-            mid_atr = ta.volatility.AverageTrueRange(df_mid['high'], df_mid['low'], df_mid['close']).average_true_range().iloc[-1]
+            mid_atr = wilder_atr(df_mid['high'].to_numpy(dtype=float), df_mid['low'].to_numpy(dtype=float), df_mid['close'].to_numpy(dtype=float))[-1]
 
             # Pullback Detection: Small must be opposite to Mid/High
-            is_pullback_buy = "BUY" in rec_high and "BUY" in rec_mid and ("SELL" in rec_small or "NEUTRAL" in rec_small)
-            is_pullback_sell = "SELL" in rec_high and "SELL" in rec_mid and ("BUY" in rec_small or "NEUTRAL" in rec_small)
+            f_small = a_small.flags
+            f_high = a_high.flags
+            trend = f_high & a_mid.flags
+            is_pullback_buy = trend & RecFlag.BUY and not f_small & RecFlag.BUY
+            is_pullback_sell = trend & RecFlag.SELL and not f_small & RecFlag.SELL
 
             label = "NEUTRAL"
             if is_pullback_buy: label = "PULLBACK_BUY"
             elif is_pullback_sell: label = "PULLBACK_SELL"
-            elif "BUY" in rec_high and "BUY" in rec_mid and "BUY" in rec_small: label = "ALIGNED_BUY"
-            elif "SELL" in rec_high and "SELL" in rec_mid and "SELL" in rec_small: label = "ALIGNED_SELL"
+            elif trend & f_small & RecFlag.BUY: label = "ALIGNED_BUY"
+            elif trend & f_small & RecFlag.SELL: label = "ALIGNED_SELL"
 
             self.screener_data[symbol] = {
                 'confidence': round(confidence, 1),
                 'label': label,
-                'direction': 'CALL' if ("BUY" in rec_high) else 'PUT',
+                'direction': 'CALL' if f_high & RecFlag.BUY else 'PUT',
                 'over_adr': over_adr,
                 'regime': a_mid.summary['RECOMMENDATION'],
                 'summary_small': a_small.summary['RECOMMENDATION'],
                 'summary_mid': a_mid.summary['RECOMMENDATION'],
                 'summary_high': a_high.summary['RECOMMENDATION'],
-                'atr': round(mid_atr, 4),
+                'atr': round(float(mid_atr), 4),
                 'last_update': time.time()
             }
-            self.emit('screener_update', {'symbol': symbol, 'data': self.screener_data[symbol]})
+            return self.screener_data[symbol]
 
         except Exception as e:
             logging.error(f"Strategy 7 update error for {symbol}: {e}")
@@ -1259,8 +1386,6 @@ class TradingBotEngine:
         if time.time() - cache['timestamp'] > 65: return
 
         rec_small = cache['small'].summary['RECOMMENDATION']
-        rec_mid = cache['mid'].summary['RECOMMENDATION']
-        rec_high = cache['high'].summary['RECOMMENDATION']
 
         # v4.0 Pullback Alignment: Enter when Small flips back to main trend
         # We need to track previous state to detect the flip
@@ -1269,13 +1394,17 @@ class TradingBotEngine:
 
         signal = None
 
+        f_small = cache['small'].flags
+        f_prev = REC_FLAGS.get(prev_small, 0)
+        trend = cache['high'].flags & cache['mid'].flags
+
         # Pullback Entry: HTF/Mid Bullish, Small WAS not Bullish, NOW IS Bullish
-        if "BUY" in rec_high and "BUY" in rec_mid:
-            if "BUY" in rec_small and (prev_small is None or "BUY" not in prev_small):
+        if trend & RecFlag.BUY:
+            if f_small & RecFlag.BUY and not f_prev & RecFlag.BUY:
                 signal = 'buy'
                 self.log(f"Strategy 7: Pullback entry BUY on {symbol} (1m flipped back to trend)")
-        elif "SELL" in rec_high and "SELL" in rec_mid:
-            if "SELL" in rec_small and (prev_small is None or "SELL" not in prev_small):
+        elif trend & RecFlag.SELL:
+            if f_small & RecFlag.SELL and not f_prev & RecFlag.SELL:
                 signal = 'sell'
                 self.log(f"Strategy 7: Pullback entry SELL on {symbol}")
 
@@ -1298,14 +1427,6 @@ class TradingBotEngine:
 
         strat_key = self.config.get('active_strategy')
 
-        # v4.0 Zone Width Validation: Skip if > 1.5x ATR
-        atr_val = 0
-        if granularity == 3600:
-            df = pd.DataFrame(sd.get('htf_candles', []))
-            if len(df) >= 14: atr_val = ta.volatility.AverageTrueRange(df['high'], df['low'], df['close']).average_true_range().iloc[-1]
-        elif granularity == 900:
-            df = pd.DataFrame(sd.get('m15_candles', []))
-            if len(df) >= 14: atr_val = ta.volatility.AverageTrueRange(df['high'], df['low'], df['close']).average_true_range().iloc[-1]
         if granularity is None:
             strat = self.STRATEGY_MAP.get(strat_key, self.STRATEGY_MAP['strategy_1'])
             granularity = strat['htf_granularity']
@@ -1557,46 +1678,45 @@ class TradingBotEngine:
             pattern = self._check_price_action_patterns(sd['ltf_candles'])
             if not pattern or pattern == "marubozu": return
 
-            # v4.0 Momentum Exhaustion Filter: 5m RSI
-            if len(sd.get('m5_candles', [])) >= 14:
-                df_m5 = pd.DataFrame(sd['m5_candles'])
-                rsi_m5 = ta.momentum.RSIIndicator(df_m5['close']).rsi().iloc[-1]
-            else: rsi_m5 = 50
-
             # Pattern Scoring
             pattern_score = self._score_reversal_pattern(symbol, pattern, sd['ltf_candles'])
             if pattern_score < 2: return
 
+            # Check if current candle touched any zone (Buffer: 0.02%)
+            touched_zones = [
+                z for z in zones
+                if current_ltf['low'] <= (z['price'] + z['price'] * 0.0002) and current_ltf['high'] >= (z['price'] - z['price'] * 0.0002)
+            ]
+            if not touched_zones: return # No zone contact: skip the RSI/EMA filters entirely
+
+            # v4.0 Momentum Exhaustion Filter: 5m RSI
+            if len(sd.get('m5_candles', [])) >= 14:
+                rsi_m5 = ta.momentum.RSIIndicator(pd.Series(self._closes(sd['m5_candles']))).rsi().iat[-1]
+            else: rsi_m5 = 50
+
             # HTF EMA Confluence
             if len(sd.get('htf_candles', [])) >= 50:
-                df_h1 = pd.DataFrame(sd['htf_candles'])
-                ema50_h1 = ta.trend.EMAIndicator(df_h1['close'], window=50).ema_indicator().iloc[-1]
+                ema50_h1 = ema_last(self._closes(sd['htf_candles']), 50)
             else: ema50_h1 = None
 
-            # Check if current candle touched any zone
-            for z in zones:
-                # Buffer: 0.02%
-                buffer = z['price'] * 0.0002
-                touched = current_ltf['low'] <= (z['price'] + buffer) and current_ltf['high'] >= (z['price'] - buffer)
-
-                if touched:
-                    # Bullish Reversal at Support or Flip
-                    if z['type'] in ['S', 'Flip'] and pattern in ['bullish_pin', 'bullish_engulfing', 'doji', 'tweezer_bottom', 'bullish_harami']:
-                        if rsi_m5 < 80: # Momentum exhaustion filter
-                            # Confluence: Alignment with H1 EMA 50
-                            if ema50_h1 is None or current_price > ema50_h1:
-                                signal = 'buy'
-                                z['total_lifetime_touches'] = z.get('total_lifetime_touches', 0) + 1
-                                self.log(f"Strategy 4 BUY Signal: {pattern} (Score: {pattern_score}) at {z['type']} zone {z['price']:.2f}")
-                                break
-                    # Bearish Reversal at Resistance or Flip
-                    elif z['type'] in ['R', 'Flip'] and pattern in ['bearish_pin', 'bearish_engulfing', 'doji', 'tweezer_top', 'bearish_harami']:
-                        if rsi_m5 > 20: # Momentum exhaustion filter
-                            if ema50_h1 is None or current_price < ema50_h1:
-                                signal = 'sell'
-                                z['total_lifetime_touches'] = z.get('total_lifetime_touches', 0) + 1
-                                self.log(f"Strategy 4 SELL Signal: {pattern} (Score: {pattern_score}) at {z['type']} zone {z['price']:.2f}")
-                                break
+            for z in touched_zones:
+                # Bullish Reversal at Support or Flip
+                if z['type'] in ['S', 'Flip'] and pattern in ['bullish_pin', 'bullish_engulfing', 'doji', 'tweezer_bottom', 'bullish_harami']:
+                    if rsi_m5 < 80: # Momentum exhaustion filter
+                        # Confluence: Alignment with H1 EMA 50
+                        if ema50_h1 is None or current_price > ema50_h1:
+                            signal = 'buy'
+                            z['total_lifetime_touches'] = z.get('total_lifetime_touches', 0) + 1
+                            self.log(f"Strategy 4 BUY Signal: {pattern} (Score: {pattern_score}) at {z['type']} zone {z['price']:.2f}")
+                            break
+                # Bearish Reversal at Resistance or Flip
+                elif z['type'] in ['R', 'Flip'] and pattern in ['bearish_pin', 'bearish_engulfing', 'doji', 'tweezer_top', 'bearish_harami']:
+                    if rsi_m5 > 20: # Momentum exhaustion filter
+                        if ema50_h1 is None or current_price < ema50_h1:
+                            signal = 'sell'
+                            z['total_lifetime_touches'] = z.get('total_lifetime_touches', 0) + 1
+                            self.log(f"Strategy 4 SELL Signal: {pattern} (Score: {pattern_score}) at {z['type']} zone {z['price']:.2f}")
+                            break
         elif strat_key == 'strategy_7':
             # Strategy 7: Multi-Timeframe Alignment
             self._process_strategy_7(symbol, is_candle_close)
@@ -1623,20 +1743,21 @@ class TradingBotEngine:
                         return # Skip v2.1 logic below
 
                     # Trend & Structure Alignment: Pullback to 15m EMA 50 or SuperTrend
-                    df_m15 = pd.DataFrame(sd.get('m15_candles', []))
-                    if not df_m15.empty:
-                        ema50_15 = ta.trend.EMAIndicator(df_m15['close'], window=50).ema_indicator().iloc[-1]
-                        st_15, st_dir_15 = self._calculate_supertrend(df_m15)
+                    m15_candles = sd.get('m15_candles', [])
+                    if m15_candles:
+                        trend_15 = self._m15_trend(symbol, m15_candles)
+                        ema50_15 = trend_15['ema50']
+                        st_15 = trend_15['st']
 
-                        price_15 = df_m15['close'].iloc[-1]
+                        price_15 = m15_candles[-1]['close']
                         near_zone = (abs(price_15 - ema50_15) / ema50_15 < 0.005) or \
-                                    (abs(price_15 - st_15.iloc[-1]) / st_15.iloc[-1] < 0.005)
+                                    (abs(price_15 - st_15) / st_15 < 0.005)
 
                         if near_zone:
                             # 5m chart shows momentum resumption
-                            df_m5 = pd.DataFrame(sd.get('m5_candles', []))
-                            if not df_m5.empty:
-                                last_m5 = df_m5.iloc[-1]
+                            m5_candles = sd.get('m5_candles', [])
+                            if m5_candles:
+                                last_m5 = m5_candles[-1]
                                 m5_resumed = (direction == 'CALL' and last_m5['close'] > last_m5['open']) or \
                                              (direction == 'PUT' and last_m5['close'] < last_m5['open'])
 
@@ -1674,12 +1795,12 @@ class TradingBotEngine:
 
                     # Fallback to S/R or BB
                     if not at_structure:
-                        df_m15 = pd.DataFrame(sd.get('m15_candles', []))
-                        if not df_m15.empty:
-                            bb_15 = ta.volatility.BollingerBands(df_m15['close'])
-                            price_15 = df_m15['close'].iloc[-1]
-                            at_bb = (direction == 'PUT' and price_15 >= bb_15.bollinger_hband().iloc[-1]) or \
-                                    (direction == 'CALL' and price_15 <= bb_15.bollinger_lband().iloc[-1])
+                        m15_candles = sd.get('m15_candles', [])
+                        if m15_candles:
+                            bb_15 = ta.volatility.BollingerBands(pd.Series(self._closes(m15_candles)))
+                            price_15 = m15_candles[-1]['close']
+                            at_bb = (direction == 'PUT' and price_15 >= bb_15.bollinger_hband().iat[-1]) or \
+                                    (direction == 'CALL' and price_15 <= bb_15.bollinger_lband().iat[-1])
 
                             zones = sd.get('snr_zones', [])
                             at_snr = any(abs(price_15 - z['price']) / z['price'] < 0.002 for z in zones)
@@ -1723,8 +1844,7 @@ class TradingBotEngine:
 
                 # Trend Filter: 4H 100 EMA
                 if len(sd.get('h4_candles', [])) >= 100:
-                    df_h4 = pd.DataFrame(sd['h4_candles'])
-                    ema100_h4 = ta.trend.EMAIndicator(df_h4['close'], window=100).ema_indicator().iloc[-1]
+                    ema100_h4 = ema_last(self._closes(sd['h4_candles']), 100)
                     if current_price > ema100_h4: trend_bias = 'buy'
                     else: trend_bias = 'sell'
                 else: trend_bias = None
@@ -1739,15 +1859,14 @@ class TradingBotEngine:
                 # v4.0 Strategy 2 Improvements
                 # 1. Momentum Qualifier: 3m RSI
                 if len(sd.get('m3_candles', [])) >= 14:
-                    df_m3 = pd.DataFrame(sd['m3_candles'])
-                    rsi_m3 = ta.momentum.RSIIndicator(df_m3['close']).rsi().iloc[-1]
+                    rsi_m3 = ta.momentum.RSIIndicator(pd.Series(self._closes(sd['m3_candles']))).rsi().iat[-1]
                 else: rsi_m3 = 50
 
                 # 2. HTF Bias Gate: 4H EMA 21 vs 50
                 if len(sd.get('h4_candles', [])) >= 50:
-                    df_h4 = pd.DataFrame(sd['h4_candles'])
-                    ema21_h4 = ta.trend.EMAIndicator(df_h4['close'], window=21).ema_indicator().iloc[-1]
-                    ema50_h4 = ta.trend.EMAIndicator(df_h4['close'], window=50).ema_indicator().iloc[-1]
+                    closes_h4 = self._closes(sd['h4_candles'])
+                    ema21_h4 = ema_last(closes_h4, 21)
+                    ema50_h4 = ema_last(closes_h4, 50)
                     bias = 'buy' if ema21_h4 > ema50_h4 else 'sell'
                 else: bias = None
 
@@ -1771,8 +1890,7 @@ class TradingBotEngine:
                 # 2. Volatility Regime Check: 1m ATR percentile
                 atr_1m = 0
                 if len(sd['ltf_candles']) >= 14:
-                    df_1m = pd.DataFrame(sd['ltf_candles'])
-                    atr_1m = ta.volatility.AverageTrueRange(df_1m['high'], df_1m['low'], df_1m['close']).average_true_range().iloc[-1]
+                    atr_1m = self._latest_atr(symbol, 'ltf', sd['ltf_candles'])
                     sd['atr_1m_history'].append(atr_1m)
 
                 if len(sd['atr_1m_history']) >= 20:
@@ -1815,6 +1933,34 @@ class TradingBotEngine:
 
             self._execute_trade(symbol, signal)
 
+    def _m15_trend(self, symbol, m15_candles):
+        """15m EMA50 and SuperTrend line/direction at the last bar, recomputed only when the 15m frame changes."""
+        key = self._candles_key(m15_candles)
+        cached = self._m15_trend_cache.get(symbol)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        high, low, close = self._hlc_arrays(m15_candles)
+        st, st_dir = self._calculate_supertrend(high, low, close)
+        trend = {
+            'ema50': ema_last(close, 50),
+            'st': st[-1],
+            'st_dir': st_dir[-1]
+        }
+        self._m15_trend_cache[symbol] = (key, trend)
+        return trend
+
+    def _exit_signals(self, symbol, htf_candles, m15_candles):
+        """1H MACD divergence and 15m SuperTrend direction for the exit engine, recomputed only when a frame changes."""
+        key = self._candles_key(htf_candles)
+        cached = self._exit_ta_cache.get(symbol)
+        if cached and cached[0] == key:
+            div = cached[1]
+        else:
+            div = self._detect_macd_divergence(self._closes(htf_candles))
+            self._exit_ta_cache[symbol] = (key, div)
+        return div, self._m15_trend(symbol, m15_candles)['st_dir']
+
     def _monitor_open_contracts(self, symbol=None, current_price=None):
         now_epoch = int(time.time())
         force_close_enabled = self.config.get('force_close_enabled', False)
@@ -1844,8 +1990,7 @@ class TradingBotEngine:
 
                     # Exit at +2 Daily ATRs
                     if len(sd.get('daily_candles', [])) >= 14:
-                        df_d = pd.DataFrame(sd['daily_candles'])
-                        daily_atr = ta.volatility.AverageTrueRange(df_d['high'], df_d['low'], df_d['close']).average_true_range().iloc[-1]
+                        daily_atr = self._latest_atr(symbol, 'daily', sd['daily_candles'])
                         entry_p = c.get('entry_price')
                         if entry_p:
                             profit_dist = (current_price - entry_p) if is_long else (entry_p - current_price)
@@ -1856,14 +2001,14 @@ class TradingBotEngine:
 
             if (strat_key == 'strategy_5' or strat_key == 'strategy_7') and current_price:
                 sd = self.symbol_data.get(symbol, {})
-                df_h = pd.DataFrame(sd.get('htf_candles', []))
-                df_m15 = pd.DataFrame(sd.get('m15_candles', []))
+                htf_candles = sd.get('htf_candles', [])
+                m15_candles = sd.get('m15_candles', [])
 
-                if not df_h.empty and len(df_h) >= 20 and not df_m15.empty and len(df_m15) >= 20:
+                if len(htf_candles) >= 20 and len(m15_candles) >= 20:
                     exit_reason = None
+                    div, st_dir_15 = self._exit_signals(symbol, htf_candles, m15_candles)
 
                     # 1. Divergence Hard Exit (1H)
-                    div = self._detect_macd_divergence(df_h)
                     if (is_long and div == -1) or (not is_long and div == 1):
                         exit_reason = "MACD Divergence detected"
 
@@ -1871,7 +2016,7 @@ class TradingBotEngine:
                     is_multiplier = c.get('contract_type') in ['MULTUP', 'MULTDOWN']
                     if is_multiplier and not exit_reason:
                         entry_price = c.get('entry_price')
-                        atr_1h = ta.volatility.AverageTrueRange(df_h['high'], df_h['low'], df_h['close']).average_true_range().iloc[-1]
+                        atr_1h = self._latest_atr(symbol, 'htf', sd['htf_candles'])
 
                         if entry_price:
                             profit_pips = (current_price - entry_price) if is_long else (entry_price - current_price)
@@ -1896,8 +2041,7 @@ class TradingBotEngine:
 
                             # SuperTrend Trailing (15m)
                             if c.get('is_freeride'):
-                                _, st_dir = self._calculate_supertrend(df_m15)
-                                if (is_long and st_dir.iloc[-1] == -1) or (not is_long and st_dir.iloc[-1] == 1):
+                                if (is_long and st_dir_15 == -1) or (not is_long and st_dir_15 == 1):
                                     exit_reason = "15m SuperTrend reversal (Trailing)"
 
                     if exit_reason:
@@ -1993,12 +2137,6 @@ class TradingBotEngine:
         custom_expiry = self.config.get('custom_expiry', 'default')
 
         if strat_key == 'strategy_1':
-            # v4.0 Dynamic Expiry: Check if price moved > 2 Daily ATRs
-            daily_atr = 0
-            if len(sd.get('daily_candles', [])) >= 14:
-                df_d = pd.DataFrame(sd['daily_candles'])
-                daily_atr = ta.volatility.AverageTrueRange(df_d['high'], df_d['low'], df_d['close']).average_true_range().iloc[-1]
-
             # For now, Strategy 1 remains EOD as base, but we will add ATR TP in monitor
             end_of_day = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
             duration_seconds = int((end_of_day - now).total_seconds())
@@ -2009,8 +2147,7 @@ class TradingBotEngine:
             # If moved > 1 ATR away from 1H open, reduce to 30m
             duration_seconds = 3600
             if len(sd.get('htf_candles', [])) >= 14:
-                df_h = pd.DataFrame(sd['htf_candles'])
-                h1_atr = ta.volatility.AverageTrueRange(df_h['high'], df_h['low'], df_h['close']).average_true_range().iloc[-1]
+                h1_atr = self._latest_atr(symbol, 'htf', sd['htf_candles'])
                 dist = abs(sd['last_tick'] - sd['htf_open'])
                 if dist > h1_atr:
                     duration_seconds = 1800
@@ -2039,8 +2176,7 @@ class TradingBotEngine:
                 if sd['ltf_candles']:
                     last_c = sd['ltf_candles'][-1]
                     body = abs(last_c['close'] - last_c['open'])
-                    df_ltf = pd.DataFrame(sd['ltf_candles'])
-                    avg_atr = ta.volatility.AverageTrueRange(df_ltf['high'], df_ltf['low'], df_ltf['close']).average_true_range().mean()
+                    avg_atr = wilder_atr(*self._hlc_arrays(sd['ltf_candles'])).mean()
                     if body > (avg_atr * 0.3):
                         self.log(f"Strategy 5 Scalp CANCELLED: Late entry (body {body:.4f} > 30% avg ATR {avg_atr*0.3:.4f})")
                         return
@@ -2071,7 +2207,7 @@ class TradingBotEngine:
             if custom_expiry != 'default':
                 try:
                     duration_seconds = int(custom_expiry)
-                except:
+                except (TypeError, ValueError):
                     duration_seconds = strat['duration']
             else:
                 # Calculate duration till NEXT HTF candle close for Strategy 2 and 3
@@ -2313,7 +2449,7 @@ class TradingBotEngine:
                         self._close_contract(cid)
 
             self._update_aggregated_positions()
-            self._emit_updates()
+            self.updates_pending = True
         except Exception as e:
             self.log(f"Error handling contract update: {e}", 'error')
 
@@ -2391,11 +2527,12 @@ class TradingBotEngine:
                     self.position_qty[side] = c['stake'] or 0.0
 
     def _emit_updates(self):
-        self.open_trades = []
+        # Built locally and published once: this runs on both the metrics and trading threads
+        open_trades = []
         floating_pnl = 0.0
         used_notional = 0.0
-        for cid, c in self.contracts.items():
-            self.open_trades.append({
+        for cid, c in list(self.contracts.items()):
+            open_trades.append({
                 'id': cid, 'type': c['side'].capitalize(), 'symbol': c['symbol'],
                 'entry_spot_price': c['entry_price'], 'stake': c['stake'], 'pnl': c['pnl'],
                 'expiry_time': c['expiry_time'],
@@ -2404,6 +2541,7 @@ class TradingBotEngine:
             })
             floating_pnl += c['pnl']
             used_notional += c['stake']
+        self.open_trades = open_trades
 
         self.net_profit = floating_pnl + self.net_trade_profit
         self.used_amount_notional = used_notional
@@ -2423,9 +2561,9 @@ class TradingBotEngine:
             'active_strategy': self.config.get('active_strategy'),
             'total_balance': self.account_balance,
             'available_balance': self.available_balance,
-            'open_trades': self.open_trades,
+            'open_trades': open_trades,
             'net_profit': self.net_profit,
-            'total_trades': self.total_trades_count + len(self.open_trades),
+            'total_trades': self.total_trades_count + len(open_trades),
             'win_rate': round(win_rate, 1),
             'avg_pnl': round(avg_pnl, 2),
             'total_capital': self.total_equity,
@@ -2443,18 +2581,37 @@ class TradingBotEngine:
             'position_entry_price': self.position_entry_price
         }
         self.emit('account_update', payload)
-        self.emit('trades_update', {'trades': self.open_trades})
+        self.emit('trades_update', {'trades': open_trades})
+
+    def _metrics_loop(self):
+        """Single timed sweep that coalesces balance/contract updates into one account_update emit."""
+        while not self.stop_event.is_set():
+            if self.updates_pending:
+                self.updates_pending = False
+                try:
+                    self._emit_updates()
+                except Exception as e:
+                    logging.error(f"Metrics sweep error: {e}")
+            self.stop_event.wait(2.0)
 
     def start(self, passive_monitoring=False):
         self.is_running = not passive_monitoring
         self.log(f"Bot started | Trading: {'ON' if self.is_running else 'OFF'}")
 
+        ws_alive = self.ws_thread and self.ws_thread.is_alive()
+        if not ws_alive:
+            # Clear before any worker starts so a stop_event left set by stop_bot() does not end them at once
+            self.stop_event.clear()
+
         if not self.screener_thread or not self.screener_thread.is_alive():
             self.screener_thread = threading.Thread(target=self._background_screener_loop, daemon=True)
             self.screener_thread.start()
 
-        if not self.ws_thread or not self.ws_thread.is_alive():
-            self.stop_event.clear()
+        if not self.metrics_thread or not self.metrics_thread.is_alive():
+            self.metrics_thread = threading.Thread(target=self._metrics_loop, daemon=True)
+            self.metrics_thread.start()
+
+        if not ws_alive:
             self.ws_thread = threading.Thread(target=self._run_ws, daemon=True)
             self.ws_thread.start()
         elif self.is_running and self.ws and self.ws.sock and self.ws.sock.connected:
@@ -2530,7 +2687,7 @@ class TradingBotEngine:
             res = json.loads(ws.recv())
             ws.close()
             return 'authorize' in res and 'error' not in res
-        except: return False
+        except Exception: return False
 
     def apply_live_config_update(self, new_config):
         old_symbols = set(self.config.get('symbols', []))
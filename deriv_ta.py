@@ -7,7 +7,7 @@ import pandas as pd
 import websockets
 from dataclasses import dataclass, field
 from typing import Optional
-from enum import Enum
+from enum import Enum, IntFlag
 
 
 # ─────────────────────────────────────────────
@@ -15,6 +15,7 @@ from enum import Enum
 # ─────────────────────────────────────────────
 
 DERIV_WS_URL = "wss://ws.binaryws.com/websockets/v3?app_id=1089"
+FETCH_TIMEOUT = 20  # Seconds allowed for a multi-granularity fetch before giving up
 
 # All available Deriv synthetic volatility symbols
 class Symbol:
@@ -67,6 +68,24 @@ class Interval(Enum):
     INTERVAL_1_DAY      = 86400
 
 
+class RecFlag(IntFlag):
+    """Bit form of a RECOMMENDATION, so timeframe alignment is a bitwise AND."""
+    NEUTRAL = 0
+    BUY     = 1
+    SELL    = 2
+    STRONG  = 4
+
+
+# Plain ints so callers' bit tests stay on int fast paths
+REC_FLAGS = {
+    "STRONG_BUY":  int(RecFlag.BUY | RecFlag.STRONG),
+    "BUY":         int(RecFlag.BUY),
+    "NEUTRAL":     int(RecFlag.NEUTRAL),
+    "SELL":        int(RecFlag.SELL),
+    "STRONG_SELL": int(RecFlag.SELL | RecFlag.STRONG),
+}
+
+
 # ─────────────────────────────────────────────
 #  DATA STRUCTURES
 # ─────────────────────────────────────────────
@@ -81,6 +100,11 @@ class Analysis:
     oscillators: dict = field(default_factory=dict)
     indicators: dict = field(default_factory=dict)  # raw indicator values
 
+    @property
+    def flags(self) -> int:
+        """RECOMMENDATION as RecFlag bits (0 when missing)."""
+        return REC_FLAGS.get(self.summary.get("RECOMMENDATION"), 0)
+
     def __repr__(self):
         return (
             f"Analysis(symbol={self.symbol}, interval={self.interval}, "
@@ -389,8 +413,7 @@ def _compute_analysis(df: pd.DataFrame, symbol: str, interval_name: str) -> Anal
 #  DERIV DATA FETCHER
 # ─────────────────────────────────────────────
 
-async def _fetch_candles(symbol: str, granularity: int, count: int = 300) -> pd.DataFrame:
-    """Fetch OHLC candles from Deriv WebSocket API."""
+def _candles_request(symbol: str, granularity: int, count: int, req_id: Optional[int] = None) -> dict:
     end_time   = int(time.time())
     start_time = end_time - granularity * count
 
@@ -402,11 +425,12 @@ async def _fetch_candles(symbol: str, granularity: int, count: int = 300) -> pd.
         "end":           end_time,
         "count":         count,
     }
+    if req_id is not None:
+        request["req_id"] = req_id
+    return request
 
-    async with websockets.connect(DERIV_WS_URL) as ws:
-        await ws.send(json.dumps(request))
-        response = json.loads(await ws.recv())
 
+def _candles_to_df(response: dict, symbol: str) -> pd.DataFrame:
     if "error" in response:
         raise ValueError(f"Deriv API error: {response['error']['message']}")
 
@@ -422,6 +446,61 @@ async def _fetch_candles(symbol: str, granularity: int, count: int = 300) -> pd.
     return df
 
 
+async def _fetch_candles(symbol: str, granularity: int, count: int = 300) -> pd.DataFrame:
+    """Fetch OHLC candles from Deriv WebSocket API."""
+    async with websockets.connect(DERIV_WS_URL) as ws:
+        await ws.send(json.dumps(_candles_request(symbol, granularity, count)))
+        response = json.loads(await ws.recv())
+    return _candles_to_df(response, symbol)
+
+
+async def _exchange(ws, symbol: str, granularities: list, count: int) -> dict:
+    """Send one tagged request per granularity and collect the replies by req_id."""
+    for req_id, granularity in enumerate(granularities, start=1):
+        await ws.send(json.dumps(_candles_request(symbol, granularity, count, req_id)))
+
+    responses = {}
+    while len(responses) < len(granularities):
+        response = json.loads(await ws.recv())
+        req_id = response.get("req_id")
+        if not isinstance(req_id, int) or not 1 <= req_id <= len(granularities):
+            raise ValueError(f"Unexpected reply for symbol {symbol}: req_id={req_id!r}")
+        responses[req_id] = response
+    return responses
+
+
+async def _fetch_many(symbol: str, granularities: list, count: int = 300) -> list:
+    """
+    Fetch several granularities for one symbol over a single connection.
+    All requests go out at once (tagged with req_id) and replies are matched
+    back as they arrive, so the cost is one handshake plus max(latency).
+    Raises asyncio.TimeoutError if all replies are not in within FETCH_TIMEOUT.
+    """
+    async with websockets.connect(DERIV_WS_URL) as ws:
+        try:
+            responses = await asyncio.wait_for(_exchange(ws, symbol, granularities, count), FETCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"No candle replies for symbol {symbol} within {FETCH_TIMEOUT}s") from None
+
+    return [_candles_to_df(responses[req_id], symbol) for req_id in range(1, len(granularities) + 1)]
+
+
+async def get_multiple_analysis_async(symbol: str, intervals: list, candle_count: int = 300) -> dict:
+    """
+    Fetch and analyse several intervals for one symbol over a single
+    connection, so the network wait is max(fetch) instead of sum(fetch).
+    Meant for callers that already run an event loop and gather several symbols.
+
+    Returns {Interval: (Analysis, DataFrame)}; duplicate intervals are fetched once.
+    """
+    unique = list(dict.fromkeys(intervals))
+    frames = await _fetch_many(symbol, [i.value for i in unique], candle_count)
+    return {
+        interval: (_compute_analysis(df, symbol, interval.name), df)
+        for interval, df in zip(unique, frames)
+    }
+
+
 # ─────────────────────────────────────────────
 #  MAIN HANDLER  (mirrors TA_Handler API)
 # ─────────────────────────────────────────────
@@ -0,0 +1,161 @@
+"""
+Numeric kernels for the recursive indicators the engine evaluates every sweep.
+
+Each kernel works on plain float64 numpy arrays. When numba is installed they are
+compiled with @njit (cached on disk); otherwise they run as ordinary Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+# ─────────────────────────────────────────────
+#  VOLATILITY
+# ─────────────────────────────────────────────
+
+@njit(cache=True)
+def wilder_atr(high, low, close, window=14):
+    """Wilder ATR, seeded like ta's AverageTrueRange (zeros before the first full window)."""
+    n = len(close)
+    atr = np.zeros(n)
+    if n < window:
+        return atr
+    tr = np.empty(n)
+    tr[0] = high[0] - low[0]
+    for i in range(1, n):
+        tr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+    atr[window - 1] = tr[:window].mean()
+    for i in range(window, n):
+        atr[i] = (atr[i - 1] * (window - 1) + tr[i]) / window
+    return atr
+
+
+# ─────────────────────────────────────────────
+#  TREND
+# ─────────────────────────────────────────────
+
+@njit(cache=True)
+def supertrend(high, low, close, atr, multiplier=3.0):
+    """Supertrend line and direction (1 up, -1 down) from a precomputed ATR series."""
+    n = len(close)
+    hl2 = (high + low) / 2
+    upperband = hl2 + multiplier * atr
+    lowerband = hl2 - multiplier * atr
+
+    final_upperband = upperband.copy()
+    final_lowerband = lowerband.copy()
+    for i in range(1, n):
+        if upperband[i] < final_upperband[i - 1] or close[i - 1] > final_upperband[i - 1]:
+            final_upperband[i] = upperband[i]
+        else:
+            final_upperband[i] = final_upperband[i - 1]
+
+        if lowerband[i] > final_lowerband[i - 1] or close[i - 1] < final_lowerband[i - 1]:
+            final_lowerband[i] = lowerband[i]
+        else:
+            final_lowerband[i] = final_lowerband[i - 1]
+
+    line = np.zeros(n)
+    direction = np.ones(n, dtype=np.int64)
+    for i in range(1, n):
+        if i == 1:
+            line[i] = final_upperband[i]
+            direction[i] = -1
+            continue
+        if line[i - 1] == final_upperband[i - 1]:
+            if close[i] > final_upperband[i]:
+                line[i] = final_lowerband[i]
+                direction[i] = 1
+            else:
+                line[i] = final_upperband[i]
+                direction[i] = -1
+        else:
+            if close[i] < final_lowerband[i]:
+                line[i] = final_upperband[i]
+                direction[i] = -1
+            else:
+                line[i] = final_lowerband[i]
+                direction[i] = 1
+    return line, direction
+
+
+@njit(cache=True)
+def ema_last(values, span):
+    """Last value of ta's EMAIndicator (pandas ewm, adjust=False); NaN until `span` values exist."""
+    n = len(values)
+    if n < span:
+        return np.nan
+    alpha = 2.0 / (span + 1.0)
+    old_wt = 1.0 - alpha
+    ema = values[0]
+    for i in range(1, n):
+        ema = (old_wt * ema + alpha * values[i]) / (old_wt + alpha)
+    return ema
+
+
+@njit(cache=True)
+def ema_series(values, span):
+    """Full ta EMAIndicator series (pandas ewm, adjust=False); NaN for the first `span - 1` bars."""
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+    alpha = 2.0 / (span + 1.0)
+    old_wt = 1.0 - alpha
+    ema = values[0]
+    if span <= 1:
+        out[0] = ema
+    for i in range(1, n):
+        ema = (old_wt * ema + alpha * values[i]) / (old_wt + alpha)
+        if i >= span - 1:
+            out[i] = ema
+    return out
+
+
+@njit(cache=True)
+def macd_line(close, fast=12, slow=26):
+    """ta's MACD line (fast EMA minus slow EMA); NaN until the slow EMA is defined."""
+    return ema_series(close, fast) - ema_series(close, slow)
+
+
+# ─────────────────────────────────────────────
+#  STATISTICS
+# ─────────────────────────────────────────────
+
+@njit(cache=True)
+def window_mean_std(values, window):
+    """Mean and sample std (ddof=1) of the trailing `window` values; NaN when too short."""
+    n = len(values)
+    if n < window or window < 2:
+        return np.nan, np.nan
+    total = 0.0
+    for i in range(n - window, n):
+        total += values[i]
+    mean = total / window
+    sq = 0.0
+    for i in range(n - window, n):
+        sq += (values[i] - mean) ** 2
+    return mean, np.sqrt(sq / (window - 1))
+
+
+def warmup():
+    """Compile (or load from the on-disk cache) every kernel with the signatures the engine uses,
+    including the default-argument forms (numba specializes a call that omits window separately).
+
+    Call once from a background thread at startup so the first screener sweep and the
+    first tick-path indicator read don't pay the JIT cost.
+    """
+    x = np.linspace(1.0, 2.0, 64)
+    atr = wilder_atr(x + 0.1, x - 0.1, x, 14)
+    wilder_atr(x + 0.1, x - 0.1, x)  # Omitted defaults compile a separate specialization
+    supertrend(x + 0.1, x - 0.1, x, atr, 3.0)
+    ema_last(x, 50)
+    macd_line(x)
+    window_mean_std(x, 20)
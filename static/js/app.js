@@ -207,8 +207,9 @@ function setupSocketListeners() {
         updateActiveTrades(data.trades);
     });
 
-    socket.on('screener_update', (data) => {
-        updateScreenerTable(data.symbol, data.data);
+    socket.on('screener_batch', (data) => {
+        Object.assign(screenerDataMap, data.updates);
+        updateScreenerTable();
     });
 
     socket.on('console_log', (data) => {